@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import functools
+import hashlib
+import math
 import os
 import pathlib
 from typing import Optional
 
 import numpy as np
 import rerun as rr  # pip install rerun-sdk
-import scipy.spatial.transform as st
 import trimesh
 import trimesh.visual
 from PIL import Image
@@ -22,28 +25,43 @@ class URDFLogger:
     def __init__(self, filepath: str, entity_path_prefix: Optional[str]) -> None:
         self.urdf = urdf_parser.URDF.from_xml_file(filepath)
         self.entity_path_prefix = entity_path_prefix
+        # Join the prefix once so per-path prefixing is a single string concatenation.
+        self._prefix = f"{entity_path_prefix}/" if entity_path_prefix is not None else ""
         self.mat_name_to_mat = {mat.name: mat for mat in self.urdf.materials}
+        self.root_name = self.urdf.get_root()
+        # Mesh files are often shared between links (e.g. symmetric limbs); parse each one only once.
+        self.mesh_cache: dict[str, trimesh.Trimesh | trimesh.Scene] = {}
+
+        # Precompute the entity path of every link with a single traversal from the root,
+        # instead of re-walking the kinematic chain for each link/joint via `get_chain`.
+        children_of: dict[str, list[str]] = {}
+        for joint in self.urdf.joints:
+            children_of.setdefault(joint.parent, []).append(joint.child)
+        self.link_name_to_path: dict[str, str] = {}
+        stack = [(self.root_name, self._prefix + self.root_name)]
+        while stack:
+            link_name, path = stack.pop()
+            self.link_name_to_path[link_name] = path
+            for child_name in children_of.get(link_name, []):
+                stack.append((child_name, f"{path}/{child_name}"))
 
     def link_entity_path(self, link: urdf_parser.Link) -> str:
         """Return the entity path for the URDF link."""
-        root_name = self.urdf.get_root()
-        link_names = self.urdf.get_chain(root_name, link.name)[0::2]  # skip the joints
-        return self.add_entity_path_prefix("/".join(link_names))
+        return self.link_name_to_path[link.name]
 
     def joint_entity_path(self, joint: urdf_parser.Joint) -> str:
         """Return the entity path for the URDF joint."""
-        root_name = self.urdf.get_root()
-        joint_names = self.urdf.get_chain(root_name, joint.child)[0::2]  # skip the links
-        return self.add_entity_path_prefix("/".join(joint_names))
+        # The joint lives at the entity path of the child link it connects.
+        return self.link_name_to_path[joint.child]
 
     def add_entity_path_prefix(self, entity_path: str) -> str:
         """Add prefix (if passed) to entity path."""
-        if self.entity_path_prefix is not None:
-            return f"{self.entity_path_prefix}/{entity_path}"
-        return entity_path
+        return self._prefix + entity_path
 
     def log(self) -> None:
         """Log a URDF file to Rerun."""
+        self.preload_meshes()
+
         for joint in self.urdf.joints:
             entity_path = self.joint_entity_path(joint)
             self.log_joint(entity_path, joint)
@@ -52,26 +70,76 @@ class URDFLogger:
             entity_path = self.link_entity_path(link)
             self.log_link(entity_path, link)
 
+    def preload_meshes(self) -> None:
+        """
+        Parse all referenced mesh files concurrently into the mesh cache.
+
+        File I/O and the C mesh parsers release the GIL, so the loads overlap;
+        logging itself stays serial.
+        """
+        to_load: dict[str, str] = {}  # cache key -> resolved path
+        for link in self.urdf.links:
+            for visual in link.visuals:
+                if isinstance(visual.geometry, urdf_parser.Mesh):
+                    try:
+                        resolved_path = resolve_ros_path(visual.geometry.filename)
+                    except ValueError:
+                        continue  # let the serial path surface the error
+                    cache_key = str(pathlib.Path(resolved_path).resolve())
+                    if cache_key not in self.mesh_cache:
+                        to_load[cache_key] = resolved_path
+
+        if len(to_load) < 2:
+            return  # nothing to overlap
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for cache_key, mesh in zip(to_load, executor.map(load_mesh_with_normals, to_load.values())):
+                self.mesh_cache[cache_key] = mesh
+
     def log_link(self, entity_path: str, link: urdf_parser.Link) -> None:
         """Log a URDF link to Rerun."""
-        # create one mesh out of all visuals
-        for i, visual in enumerate(link.visuals):
-            self.log_visual(entity_path + f"/visual_{i}", visual)
+        # Merge all untextured visuals into a single mesh so the link needs one log call
+        # instead of one per visual; textured meshes can't be merged and are logged separately.
+        mergeable: dict[Optional[tuple[float, ...]], list[trimesh.Trimesh]] = {}
+        textured: list[trimesh.Trimesh] = []
+        for visual in link.visuals:
+            for mesh, albedo_factor in self.visual_to_meshes(visual):
+                if isinstance(mesh.visual, trimesh.visual.texture.TextureVisuals):
+                    textured.append(mesh)
+                else:
+                    mergeable.setdefault(albedo_factor, []).append(mesh)
+
+        i = 0
+        for albedo_factor, meshes in mergeable.items():
+            log_trimesh(entity_path + f"/visual_{i}", trimesh.util.concatenate(meshes), albedo_factor=albedo_factor)
+            i += 1
+        for mesh in textured:
+            log_trimesh(entity_path + f"/visual_{i}", mesh)
+            i += 1
 
     def log_joint(self, entity_path: str, joint: urdf_parser.Joint) -> None:
         """Log a URDF joint to Rerun."""
         translation = rotation = None
 
-        if joint.origin is not None and joint.origin.xyz is not None:
+        if joint.origin is not None and joint.origin.xyz is not None and any(x != 0.0 for x in joint.origin.xyz):
             translation = joint.origin.xyz
 
         if joint.origin is not None and joint.origin.rpy is not None:
-            rotation = st.Rotation.from_euler("xyz", joint.origin.rpy).as_matrix()
+            rotation = rpy_to_rotation_matrix(joint.origin.rpy)
+
+        # An identity transform carries no information; skip the log call entirely.
+        if translation is None and rotation is None:
+            return
 
         rr.log(entity_path, rr.Transform3D(translation=translation, mat3x3=rotation))
 
-    def log_visual(self, entity_path: str, visual: urdf_parser.Visual) -> None:
-        """Log a URDF visual to Rerun."""
+    def visual_to_meshes(self, visual: urdf_parser.Visual) -> list[tuple[trimesh.Trimesh, Optional[tuple[float, ...]]]]:
+        """
+        Convert a URDF visual to a list of transformed trimesh.Trimesh with materials applied.
+
+        Returns (mesh, albedo_factor) pairs; a uniform material color comes back as the
+        albedo factor instead of being broadcast to every vertex.
+        """
         material = None
         if visual.material is not None:
             if visual.material.color is None and visual.material.texture is None:
@@ -81,28 +149,39 @@ class URDFLogger:
                 material = visual.material
 
         transform = np.eye(4)
-        if visual.origin is not None and visual.origin.xyz is not None:
+        is_identity = True
+        if visual.origin is not None and visual.origin.xyz is not None and any(x != 0.0 for x in visual.origin.xyz):
             transform[:3, 3] = visual.origin.xyz
+            is_identity = False
         if visual.origin is not None and visual.origin.rpy is not None:
-            transform[:3, :3] = st.Rotation.from_euler("xyz", visual.origin.rpy).as_matrix()
+            rotation = rpy_to_rotation_matrix(visual.origin.rpy)
+            if rotation is not None:
+                transform[:3, :3] = rotation
+                is_identity = False
 
         if isinstance(visual.geometry, urdf_parser.Mesh):
             resolved_path = resolve_ros_path(visual.geometry.filename)
             mesh_scale = visual.geometry.scale
-            mesh_or_scene = trimesh.load_mesh(resolved_path)
+            cache_key = str(pathlib.Path(resolved_path).resolve())
+            cached = self.mesh_cache.get(cache_key)
+            if cached is None:
+                cached = load_mesh_with_normals(resolved_path)
+                self.mesh_cache[cache_key] = cached
+            # Copy so that the transform and material applied below don't leak into the cache.
+            # Keep the cache of Trimesh copies so the precomputed normals survive.
+            if isinstance(cached, trimesh.Trimesh):
+                mesh_or_scene = cached.copy(include_cache=True)
+            else:
+                mesh_or_scene = cached.copy()
             if mesh_scale is not None:
                 transform[:3, :3] *= mesh_scale
+                is_identity = False
         elif isinstance(visual.geometry, urdf_parser.Box):
-            mesh_or_scene = trimesh.creation.box(extents=visual.geometry.size)
+            mesh_or_scene = box_mesh(tuple(visual.geometry.size)).copy(include_cache=True)
         elif isinstance(visual.geometry, urdf_parser.Cylinder):
-            mesh_or_scene = trimesh.creation.cylinder(
-                radius=visual.geometry.radius,
-                height=visual.geometry.length,
-            )
+            mesh_or_scene = cylinder_mesh(visual.geometry.radius, visual.geometry.length).copy(include_cache=True)
         elif isinstance(visual.geometry, urdf_parser.Sphere):
-            mesh_or_scene = trimesh.creation.icosphere(
-                radius=visual.geometry.radius,
-            )
+            mesh_or_scene = sphere_mesh(visual.geometry.radius).copy(include_cache=True)
         else:
             rr.log(
                 "",
@@ -110,30 +189,100 @@ class URDFLogger:
             )
             mesh_or_scene = trimesh.Trimesh()
 
-        mesh_or_scene.apply_transform(transform)
+        if not is_identity:
+            mesh_or_scene.apply_transform(transform)
 
         if isinstance(mesh_or_scene, trimesh.Scene):
-            scene = mesh_or_scene
             # use dump to apply scene graph transforms and get a list of transformed meshes
-            for i, mesh in enumerate(scene_to_trimeshes(scene)):
-                if material is not None and not isinstance(mesh.visual, trimesh.visual.texture.TextureVisuals):
-                    if material.color is not None:
-                        mesh.visual = trimesh.visual.ColorVisuals()
-                        mesh.visual.vertex_colors = material.color.rgba
-                    elif material.texture is not None:
-                        texture_path = resolve_ros_path(material.texture.filename)
-                        mesh.visual = trimesh.visual.texture.TextureVisuals(image=Image.open(texture_path))
-                log_trimesh(entity_path + f"/{i}", mesh)
+            meshes = scene_to_trimeshes(mesh_or_scene)
         else:
-            mesh = mesh_or_scene
-            if material is not None and not isinstance(mesh.visual, trimesh.visual.texture.TextureVisuals):
-                if material.color is not None:
-                    mesh.visual = trimesh.visual.ColorVisuals()
-                    mesh.visual.vertex_colors = material.color.rgba
-                elif material.texture is not None:
-                    texture_path = resolve_ros_path(material.texture.filename)
-                    mesh.visual = trimesh.visual.texture.TextureVisuals(image=Image.open(texture_path))
-            log_trimesh(entity_path, mesh)
+            meshes = [mesh_or_scene]
+
+        if material is None:
+            return [(mesh, None) for mesh in meshes]
+        return [(mesh, apply_urdf_material(mesh, material)) for mesh in meshes]
+
+
+# URDFs repeat identical primitives a lot (wheels, collision boxes, finger pads);
+# build each unique shape once, with its normals, and hand out copies.
+@functools.lru_cache(maxsize=256)
+def box_mesh(size: tuple[float, float, float]) -> trimesh.Trimesh:
+    mesh = trimesh.creation.box(extents=size)
+    _ = mesh.vertex_normals
+    return mesh
+
+
+@functools.lru_cache(maxsize=256)
+def cylinder_mesh(radius: float, length: float) -> trimesh.Trimesh:
+    mesh = trimesh.creation.cylinder(radius=radius, height=length)
+    _ = mesh.vertex_normals
+    return mesh
+
+
+@functools.lru_cache(maxsize=256)
+def sphere_mesh(radius: float) -> trimesh.Trimesh:
+    mesh = trimesh.creation.icosphere(radius=radius)
+    _ = mesh.vertex_normals
+    return mesh
+
+
+def load_mesh_with_normals(path: str) -> trimesh.Trimesh | trimesh.Scene:
+    """
+    Load a mesh file and force vertex-normal computation.
+
+    Touching `vertex_normals` here runs the O(faces) cross-product work where the
+    mesh is loaded — in a worker thread during preloading — and caches the result
+    on the mesh instead of paying for it lazily on the logging path.
+    """
+    mesh_or_scene = trimesh.load_mesh(path)
+    if isinstance(mesh_or_scene, trimesh.Trimesh):
+        _ = mesh_or_scene.vertex_normals
+    elif isinstance(mesh_or_scene, trimesh.Scene):
+        for geometry in mesh_or_scene.geometry.values():
+            if isinstance(geometry, trimesh.Trimesh):
+                _ = geometry.vertex_normals
+    return mesh_or_scene
+
+
+def apply_urdf_material(mesh: trimesh.Trimesh, material: urdf_parser.Material) -> Optional[tuple[float, ...]]:
+    """
+    Apply a URDF material to a mesh, unless the mesh file brought its own texture.
+
+    A uniform color is returned as an RGBA tuple to be passed as the mesh's albedo
+    factor — O(1) instead of materializing an (N, 4) vertex-color array.
+    """
+    # `type` identity check instead of an isinstance chain: trimesh's visuals are concrete classes.
+    if type(mesh.visual) is trimesh.visual.texture.TextureVisuals:
+        return None
+    if material.color is not None:
+        return tuple(material.color.rgba)
+    if material.texture is not None:
+        texture_path = resolve_ros_path(material.texture.filename)
+        mesh.visual = trimesh.visual.texture.TextureVisuals(image=Image.open(texture_path))
+    return None
+
+
+def rpy_to_rotation_matrix(rpy: list[float]) -> Optional[np.ndarray]:
+    """
+    Convert URDF roll-pitch-yaw angles to a 3x3 rotation matrix.
+
+    Equivalent to scipy's `Rotation.from_euler("xyz", rpy).as_matrix()`, but inlined
+    to avoid constructing a Rotation object for every joint and visual.
+    Returns None for an all-zero rpy so callers can skip the rotation entirely.
+    """
+    roll, pitch, yaw = rpy
+    if roll == 0.0 and pitch == 0.0 and yaw == 0.0:
+        return None
+    cr, sr = math.cos(roll), math.sin(roll)
+    cp, sp = math.cos(pitch), math.sin(pitch)
+    cy, sy = math.cos(yaw), math.sin(yaw)
+    return np.array(
+        [
+            [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+            [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+            [-sp, cp * sr, cp * cr],
+        ]
+    )
 
 
 def scene_to_trimeshes(scene: trimesh.Scene) -> list[trimesh.Trimesh]:
@@ -143,20 +292,28 @@ def scene_to_trimeshes(scene: trimesh.Scene) -> list[trimesh.Trimesh]:
     Skips objects that are not an instance of trimesh.Trimesh.
     """
     trimeshes = []
-    scene_dump = scene.dump()
-    geometries = [scene_dump] if not isinstance(scene_dump, list) else scene_dump
-    for geometry in geometries:
-        if isinstance(geometry, trimesh.Trimesh):
-            trimeshes.append(geometry)
-        elif isinstance(geometry, trimesh.Scene):
-            trimeshes.extend(scene_to_trimeshes(geometry))
+    # Walk nested scenes with an explicit stack instead of recursing.
+    stack = [scene]
+    while stack:
+        scene_dump = stack.pop().dump()
+        geometries = [scene_dump] if not isinstance(scene_dump, list) else scene_dump
+        for geometry in geometries:
+            if isinstance(geometry, trimesh.Trimesh):
+                trimeshes.append(geometry)
+            elif isinstance(geometry, trimesh.Scene):
+                stack.append(geometry)
     return trimeshes
 
 
-def log_trimesh(entity_path: str, mesh: trimesh.Trimesh) -> None:
+def log_trimesh(entity_path: str, mesh: trimesh.Trimesh, albedo_factor: Optional[tuple[float, ...]] = None) -> None:
     vertex_colors = albedo_texture = vertex_texcoords = None
 
-    if isinstance(mesh.visual, trimesh.visual.color.ColorVisuals):
+    # With a uniform material color the albedo factor over the default white albedo
+    # already yields the exact color; pulling vertex_colors here would materialize
+    # trimesh's per-vertex default gray and darken the result (albedo_factor multiplies).
+    if albedo_factor is not None:
+        pass
+    elif isinstance(mesh.visual, trimesh.visual.color.ColorVisuals):
         vertex_colors = mesh.visual.vertex_colors
     elif isinstance(mesh.visual, trimesh.visual.texture.TextureVisuals):
         trimesh_material = mesh.visual.material
@@ -165,55 +322,90 @@ def log_trimesh(entity_path: str, mesh: trimesh.Trimesh) -> None:
             vertex_texcoords = mesh.visual.uv
             # Trimesh uses the OpenGL convention for UV coordinates, so we need to flip the V coordinate
             # since Rerun uses the Vulkan/Metal/DX12/WebGPU convention.
-            vertex_texcoords[:, 1] = 1.0 - vertex_texcoords[:, 1]
+            # Subtract in place to avoid allocating a temporary column for the result.
+            v_coords = vertex_texcoords[:, 1]
+            np.subtract(1.0, v_coords, out=v_coords)
 
         if isinstance(trimesh_material, trimesh.visual.material.PBRMaterial):
             if trimesh_material.baseColorTexture is not None:
                 albedo_texture = pil_image_to_albedo_texture(trimesh_material.baseColorTexture)
-            elif trimesh_material.baseColorFactor is not None:
-                vertex_colors = trimesh_material.baseColorFactor
+            elif trimesh_material.baseColorFactor is not None and albedo_factor is None:
+                albedo_factor = tuple(trimesh_material.baseColorFactor)
         elif isinstance(trimesh_material, trimesh.visual.material.SimpleMaterial):
             if trimesh_material.image is not None:
                 albedo_texture = pil_image_to_albedo_texture(trimesh_material.image)
             else:
                 vertex_colors = mesh.visual.to_color().vertex_colors
 
-    rr.log(
-        entity_path,
-        rr.Mesh3D(
-            vertex_positions=mesh.vertices,
-            triangle_indices=mesh.faces,
-            vertex_normals=mesh.vertex_normals,
+    # Trimesh hands out float64 arrays; narrowing them halves the bytes copied
+    # into Arrow buffers and streamed to the viewer, at no visible precision loss.
+    if vertex_texcoords is not None:
+        vertex_texcoords = np.ascontiguousarray(vertex_texcoords, dtype=np.float32)
+    if vertex_colors is not None:
+        vertex_colors = np.asarray(vertex_colors)
+        if vertex_colors.dtype.kind == "f":
+            vertex_colors = (vertex_colors * 255.0).round().astype(np.uint8)
+    vertex_positions = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+    triangle_indices = np.ascontiguousarray(mesh.faces, dtype=np.uint32)
+    vertex_normals = np.ascontiguousarray(mesh.vertex_normals, dtype=np.float32)
+
+    # Symmetric robots send the exact same geometry under many entity paths; hash the
+    # payload and reuse the already-built archetype so its Arrow buffers are converted once.
+    mesh3d = cache_key = None
+    if albedo_texture is None:
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(vertex_positions.tobytes())
+        hasher.update(triangle_indices.tobytes())
+        if vertex_colors is not None:
+            hasher.update(np.ascontiguousarray(vertex_colors).tobytes())
+        if vertex_texcoords is not None:
+            hasher.update(vertex_texcoords.tobytes())
+        hasher.update(repr(albedo_factor).encode())
+        cache_key = hasher.digest()
+        mesh3d = _mesh3d_cache.get(cache_key)
+
+    if mesh3d is None:
+        mesh3d = rr.Mesh3D(
+            vertex_positions=vertex_positions,
+            triangle_indices=triangle_indices,
+            vertex_normals=vertex_normals,
             vertex_colors=vertex_colors,
+            albedo_factor=albedo_factor,
             albedo_texture=albedo_texture,
             vertex_texcoords=vertex_texcoords,
-        ),
-        timeless=True,
-    )
+        )
+        if cache_key is not None:
+            _mesh3d_cache[cache_key] = mesh3d
+
+    rr.log(entity_path, mesh3d, timeless=True)
+
 
+_mesh3d_cache: dict[bytes, rr.Mesh3D] = {}
 
+
+@functools.cache
 def resolve_ros_path(path_str: str) -> str:
     """Resolve a ROS path to an absolute path."""
     if path_str.startswith("package://"):
-        path = pathlib.Path(path_str)
-        package_name = path.parts[1]
-        relative_path = pathlib.Path(*path.parts[2:])
+        # Plain string splitting; no need to round-trip the URI through pathlib.
+        package_name, _, relative_path = path_str[len("package://") :].partition("/")
 
         package_path = resolve_ros1_package(package_name) or resolve_ros2_package(package_name)
 
         if package_path is None:
             raise ValueError(
-                f"Could not resolve {path}."
+                f"Could not resolve {path_str}."
                 f"Replace with relative / absolute path, source the correct ROS environment, or install {package_name}."
             )
 
-        return str(package_path / relative_path)
+        return os.path.join(package_path, relative_path)
     elif path_str.startswith("file://"):
         return path_str[len("file://") :]
     else:
         return path_str
 
 
+@functools.cache
 def resolve_ros2_package(package_name: str) -> Optional[str]:
     try:
         import ament_index_python
@@ -226,6 +418,7 @@ def resolve_ros2_package(package_name: str) -> Optional[str]:
         return None
 
 
+@functools.cache
 def resolve_ros1_package(package_name: str) -> Optional[str]:
     try:
         import rospkg
@@ -245,7 +438,8 @@ def pil_image_to_albedo_texture(image: Image.Image) -> np.ndarray:
         # If the texture is grayscale, we need to convert it to RGB since
         # Rerun expects a 3-channel texture.
         # See: https://github.com/rerun-io/rerun/issues/4878
-        albedo_texture = np.stack([albedo_texture] * 3, axis=-1)
+        # `broadcast_to` returns a zero-copy view instead of materializing three channel copies.
+        albedo_texture = np.broadcast_to(albedo_texture[..., None], (*albedo_texture.shape, 3))
     return albedo_texture
 
 
@@ -292,11 +486,9 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    is_file = os.path.isfile(args.filepath)
-    is_urdf_file = ".urdf" in args.filepath
-
     # Inform the Rerun Viewer that we do not support that kind of file.
-    if not is_file or not is_urdf_file:
+    # Check the extension first so the stat is skipped for files we'd reject anyway.
+    if not (args.filepath.endswith(".urdf") and os.path.isfile(args.filepath)):
         exit(rr.EXTERNAL_DATA_LOADER_INCOMPATIBLE_EXIT_CODE)
 
     if args.application_id is not None: